@@ -1,34 +1,56 @@
 import requests
+from requests.adapters import HTTPAdapter
+from concurrent.futures import ThreadPoolExecutor
+import orjson
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
 import pandas as pd
-import matplotlib.pyplot as plt
+import altair as alt
 import time
 import streamlit as st
-import os
 
 # Binance API endpoint
 BINANCE_API_URL = "https://api.binance.com/api/v1/klines"
 
+# Shared session so repeated Binance calls reuse pooled keep-alive connections
+SESSION = requests.Session()
+SESSION.mount("https://", HTTPAdapter(pool_connections=32, pool_maxsize=32))
+
+# Worker threads used to load all contracts concurrently
+MAX_WORKERS = 16
+
+# Seconds a cached Binance/CSV result is reused across reruns
+CACHE_TTL = 300
+
+# The top-volume futures list barely moves, so the ticker result lives longer
+TICKER_CACHE_TTL = 3600
+
+@st.cache_data(ttl=TICKER_CACHE_TTL, show_spinner=False)
 def get_top_futures_symbols(limit=20):
     url = 'https://fapi.binance.com/fapi/v1/ticker/24hr'
-    response = requests.get(url)
+    response = SESSION.get(url, timeout=10)
 
     try:
-        data = response.json()
+        # orjson decodes the ~500-entry ticker payload much faster than stdlib json
+        data = orjson.loads(response.content)
         if not isinstance(data, list):
             st.error(f"Unexpected response format from Binance API: {data}")
             return []
 
-        # Sort by quote volume descending
-        sorted_data = sorted(data, key=lambda x: float(x['quoteVolume']), reverse=True)
+        # Split into parallel arrays once, filter with vectorised string ops,
+        # then partially partition for the top `limit` instead of sorting
+        symbols = np.array([x['symbol'] for x in data], dtype=str)
+        quote_volume = np.fromiter((float(x['quoteVolume']) for x in data), dtype=float, count=len(data))
+        keep = np.strings.endswith(symbols, 'USDT') & (np.strings.find(symbols, 'PERP') < 0)
+        symbols, quote_volume = symbols[keep], quote_volume[keep]
 
-        top_symbols = []
-        for item in sorted_data:
-            if item['symbol'].endswith('USDT') and 'PERP' not in item['symbol']:
-                top_symbols.append(item['symbol'])
-            if len(top_symbols) >= limit:
-                break
+        if limit < len(symbols):
+            top = np.argpartition(-quote_volume, limit - 1)[:limit]
+        else:
+            top = np.arange(len(symbols))
+        top = top[np.argsort(-quote_volume[top], kind="stable")]
 
-        return top_symbols
+        return symbols[top].tolist()
 
     except Exception as e:
         st.error(f"Failed to fetch or parse Binance futures data: {e}")
@@ -39,40 +61,126 @@ def get_top_futures_symbols(limit=20):
 # Example list of contracts (replace with live data if needed)
 CONTRACTS = ['BTCUSDT', 'ETHUSDT', 'SOLUSDT','1000PEPEUSDT','ADAUSDT','BABYUSDT','BNBUSDT','BNXUSDT','DOGEUSDT','ENAUDST','FARTCOINUSDT','GASUSDT','KERNELUSDT','LINKUSDT','OMUSDT','ORCAUSDT','SUIUSDT','TRUMPUSDT','WCTUSDT']
 
+@st.cache_data(ttl=CACHE_TTL, show_spinner=False)
 def fetch_ohlcv(symbol, data_folder="data"):
-    file_path = os.path.join(data_folder, f"{symbol}.csv")
-    if not os.path.exists(file_path):
-        st.warning(f"No data found for {symbol}")
-        return pd.DataFrame()
-
-    df = pd.read_csv(file_path, parse_dates=["timestamp"])
+    # data_folder is a Parquet dataset partitioned by symbol; the filter prunes
+    # to one partition and an unknown symbol yields an empty frame, which the
+    # caller reports (this runs on worker threads)
+    df = pd.read_parquet(
+        data_folder,
+        filters=[("symbol", "==", symbol)],
+        columns=["timestamp", "volume", "quote_asset_volume"],
+    )
     return df
 
-def detect_volume_spikes(df, threshold_factor=2):
-    df["volume_ma"] = df["volume"].rolling(window=7).mean()
-    df["volume_std"] = df["volume"].rolling(window=7).std()
-    df["spike"] = df["volume"] > (df["volume_ma"] + threshold_factor * df["volume_std"])
-    spikes_df = df[df["spike"] & (df["quote_asset_volume"] >= 100_000_000)]
-    return spikes_df
+def rolling_mean_std(values, window=7):
+    # Rolls along the last axis, so a (contracts, days) stack is one pass;
+    # NaN-padded like pandas rolling; windows are views, so no per-window copies
+    ma = np.full(values.shape, np.nan)
+    sd = np.full(values.shape, np.nan)
+    if values.shape[-1] >= window:
+        windows = sliding_window_view(values, window, axis=-1)
+        mean = windows.mean(axis=-1)
+        # Reuse the window means instead of letting std() recompute them
+        dev = windows - mean[..., None]
+        ma[..., window - 1:] = mean
+        sd[..., window - 1:] = np.sqrt(np.einsum("...ij,...ij->...i", dev, dev) / (window - 1))
+    return ma, sd
+
+def detect_volume_spikes_batch(frames, threshold_factor=2, window=7):
+    if not frames:
+        return []
+
+    # Left-pad shorter histories with NaN: padded windows yield NaN stats,
+    # exactly like the leading rows of an unpadded rolling window
+    length = max(len(df) for df in frames)
+    volume = np.full((len(frames), length), np.nan)
+    quote_volume = np.full((len(frames), length), np.nan)
+    for i, df in enumerate(frames):
+        volume[i, length - len(df):] = df["volume"].to_numpy(dtype=float)
+        quote_volume[i, length - len(df):] = df["quote_asset_volume"].to_numpy(dtype=float)
+
+    ma, sd = rolling_mean_std(volume, window)
+
+    # The first window - 1 days have no stats and can never spike, so only
+    # the filled tail goes through the threshold comparison
+    mask = np.zeros(volume.shape, dtype=bool)
+    filled = slice(window - 1, None)
+    mask[:, filled] = (volume[:, filled] > ma[:, filled] + threshold_factor * sd[:, filled]) & (
+        quote_volume[:, filled] >= 100_000_000
+    )
+
+    # (spike row positions, rolling mean) per frame; the frames are not modified
+    results = []
+    for i, df in enumerate(frames):
+        offset = length - len(df)
+        results.append((np.flatnonzero(mask[i, offset:]), ma[i, offset:]))
+    return results
+
+def detect_volume_spikes(df, threshold_factor=2, window=7):
+    return detect_volume_spikes_batch([df], threshold_factor, window)[0]
 
 def plot_volume_spikes(df, spikes_df, selected_date=None):
-    plt.figure(figsize=(10, 6))
-    plt.plot(df["timestamp"], df["volume"], label="Volume", color='lightblue', alpha=0.7)
-    plt.scatter(spikes_df["timestamp"], spikes_df["volume"], color='red', label="Volume Spike", zorder=5)
-    plt.plot(df["timestamp"], df["volume_ma"], label="7-day MA", color='green', linestyle='--', alpha=0.7)
+    # Vega-Lite spec rendered in the browser; one colour scale drives the legend
+    colors = alt.Scale(
+        domain=["Volume", "7-day MA", "Volume Spike", "Selected Spike"],
+        range=["lightblue", "green", "red", "orange"],
+    )
+    x = alt.X("timestamp:T", title="Date", axis=alt.Axis(labelAngle=-45))
+    y = alt.Y("volume:Q", title="Volume")
+
+    def layer(data, series):
+        return alt.Chart(data).transform_calculate(series=f"'{series}'").encode(
+            x=x, color=alt.Color("series:N", scale=colors, title=None)
+        )
+
+    layers = [
+        layer(df, "Volume").mark_line(opacity=0.7).encode(y=y),
+        layer(df, "7-day MA").mark_line(strokeDash=[6, 4], opacity=0.7).encode(y=alt.Y("volume_ma:Q")),
+        layer(spikes_df, "Volume Spike").mark_circle(size=60, opacity=1).encode(y=y),
+    ]
 
     if selected_date:
-        selected_row = df[df["timestamp"] == pd.to_datetime(selected_date)]
+        # Compare raw datetime64 values against a NumPy scalar, skipping the
+        # pandas Timestamp coercion and index alignment of a Series comparison
+        selected_row = df[df["timestamp"].to_numpy() == np.datetime64(selected_date)]
         if not selected_row.empty:
-            plt.scatter(selected_row["timestamp"], selected_row["volume"], color='orange', label='Selected Spike', s=120, zorder=10)
-
-    plt.title("Trading Volume with Spikes")
-    plt.xlabel("Date")
-    plt.ylabel("Volume")
-    plt.xticks(rotation=45)
-    plt.legend()
-    plt.tight_layout()
-    st.pyplot(plt)
+            layers.append(layer(selected_row, "Selected Spike").mark_circle(size=160, opacity=1).encode(y=y))
+
+    chart = alt.layer(*layers).properties(title="Trading Volume with Spikes", height=400)
+    st.altair_chart(chart, use_container_width=True)
+
+@st.cache_resource(ttl=CACHE_TTL, show_spinner="Analyzing contracts for volume spikes...")
+def build_spike_state():
+    # Shared across sessions and reruns, so callers must not mutate the result
+    spike_summary = {}
+    all_spike_data = {}
+    missing_contracts = []
+
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        # map() keeps results in CONTRACTS order while the loads overlap
+        frames = list(executor.map(fetch_ohlcv, CONTRACTS))
+
+    loaded = {}
+    for contract, df in zip(CONTRACTS, frames):
+        if df.empty:
+            missing_contracts.append(contract)
+        else:
+            loaded[contract] = df
+
+    # One stacked rolling pass over every contract instead of one per contract
+    all_spikes = detect_volume_spikes_batch(list(loaded.values()), threshold_factor=2.2)
+
+    for (contract, df), (spike_idx, volume_ma) in zip(loaded.items(), all_spikes):
+        if len(spike_idx):
+            spikes_df = df.iloc[spike_idx]
+            spike_summary[contract] = spikes_df[["timestamp", "quote_asset_volume"]].assign(
+                timestamp=spikes_df["timestamp"].dt.strftime('%Y-%m-%d')
+            )
+            # Only contracts that get plotted need the moving average column
+            all_spike_data[contract] = (df.assign(volume_ma=volume_ma), spikes_df)
+
+    return spike_summary, all_spike_data, missing_contracts
 
 # -----------------------------
 # Streamlit App Starts Here
@@ -80,19 +188,11 @@ def plot_volume_spikes(df, spikes_df, selected_date=None):
 st.title("📊 Binance Volume Spike Analyzer")
 st.caption("Detects large volume spikes over $100M across multiple contracts.")
 
-# Step 1: Analyze all contracts for spikes
-spike_summary = {}
-all_spike_data = {}
-
-with st.spinner("Analyzing contracts for volume spikes..."):
-    for contract in CONTRACTS:
-        df = fetch_ohlcv(contract)
-        spikes_df = detect_volume_spikes(df, threshold_factor=2.2)
+# Step 1: Analyze all contracts for spikes (cached across reruns)
+spike_summary, all_spike_data, missing_contracts = build_spike_state()
 
-        if not spikes_df.empty:
-            spikes_df["timestamp"] = spikes_df["timestamp"].dt.strftime('%Y-%m-%d')
-            spike_summary[contract] = spikes_df[["timestamp", "quote_asset_volume"]]
-            all_spike_data[contract] = (df, spikes_df)
+for contract in missing_contracts:
+    st.warning(f"No data found for {contract}")
 
 # Step 2: Show list of contracts with spikes
 if spike_summary: